@@ -26,26 +26,21 @@
 import os
 import re
 import sys
+import stat
 import cmd
-import json
+import collections
+import signal
 import getopt
-import inspect
-import textwrap
-import mimetypes
-import webbrowser
-import subprocess
+import functools
 
 verbose = False
-
-def vbprint(*args, **kwargs):
-    if verbose:
-        print(*args, **kwargs)
+progName = os.path.basename(sys.argv[0])
 
 
 def error(*args, **kwargs):
     if verbose:
-        print("ERROR [",os.path.basename(sys.argv[0]),":",
-                inspect.currentframe().f_back.f_lineno,"]: ",
+        print("ERROR [",progName,":",
+                sys._getframe(1).f_lineno,"]: ",
                 *args, **kwargs, sep="", file = sys.stderr)
     else:
         print("ERROR: ", *args, **kwargs, sep="", file = sys.stderr)
@@ -53,72 +48,97 @@ def error(*args, **kwargs):
 
 def warn(*args, **kwargs):
     if verbose:
-        print("WARNING [",os.path.basename(sys.argv[0]),":",
-                inspect.currentframe().f_back.f_lineno,"]: ",
+        print("WARNING [",progName,":",
+                sys._getframe(1).f_lineno,"]: ",
                 *args, **kwargs, sep="", file = sys.stderr)
     else:
         print("WARNING: ", *args, **kwargs, sep="", file = sys.stderr)
 
+## Gemini links with a scheme (e.g. gemini: or https:) are external to the site
+_RE_EXTERNAL = re.compile(r'^[a-z]+:')
+
+## ANSI escape sequences used in the output
+_RESET   = '\x1b[0m'
+_GREEN   = '\x1b[38;5;119m'
+_BG_BLUE = '\x1b[44m'
+_BG_GREY = '\x1b[48;5;239m'
+_BOLD    = '\x1b[1m'
+_ULINE   = '\x1b[4m'
+_UP      = '\x1b[1A' # cursor one line up
+
 ###############|123456789|
 # Example      |12 (TXT) |
 gopherFiller = '         '
-gopherItems  = ['0','1','2','3','4','5','6','7','8','9','+','T','g',
-        'I','h','s','i','s']
+gopherItems  = frozenset(['0','1','2','3','4','5','6','7','8','9','+','T','g',
+        'I','h','s','i'])
+
+gopherLabels = {
+        '0': '(TXT)',   # File
+        '1': '(DIR)',   # Directory
+        '9': '(BIN)',   # Binary file
+        'g': '(GIF)',   # GIf graphic file
+        'I': '(PIC)',   # Image file (other than GIF)
+        'h': '(URL)',   # HTML file (may be a URL - indicated with 'URL:')
+        's': '(WAV)',   # Sound file
+        '>': '     ',   # Non typed item (used for gemini)
+        }
 
 def gopher_link_line(index, item, text):
-    label = '  (?)'
-    if   item == '0':     # File
-        label  = '(TXT)'
-    elif item == '1':     # Directory
-        label  = '(DIR)'
-    elif item == '9':     # Binary file
-        label  = '(BIN)'
-    elif item == 'g':     # GIf graphic file
-        label  = '(GIF)'
-    elif item == 'I':     # Image file (other than GIF)
-        label  = '(PIC)'
-    elif item == 'h':     # HTML file (may be a URL - indicated with 'URL:')
-        label  = '(URL)'
-    elif item == 's':     # Sound file
-        label  = '(WAV)'
-    elif item == '>':     # Non typed item (used for gemini)
-        label  = '     '
-    return '{:2d} {} \x1b[38;5;119m{}\x1b[0m'.format(index, label, text)
+    label = gopherLabels.get(item, '  (?)')
+    return f'{index:2d} {label} {_GREEN}{text}{_RESET}'
+
+## Names of the files rendered as pages (rather than plain files)
+geminiExts = ('.gmi', '.gemini')
+pageFiles  = ('gophermap',) + geminiExts
 
 ###############|12345|
 # Example      |12 > |
 geminiFiller = '     '
 
 def gemini_link_line(index, text):
-    return '{:2d} > \x1b[38;5;119m{}\x1b[0m'.format(index, text)
+    return f'{index:2d} > {_GREEN}{text}{_RESET}'
 
 def heading_one(line):
-    return '\x1b[1m\x1b[4m' + line + '\x1b[0m'
+    return f'{_BOLD}{_ULINE}{line}{_RESET}'
 
 def heading_two(line):
-    return '\x1b[1m' + line + '\x1b[0m'
+    return f'{_BOLD}{line}{_RESET}'
 
 def heading_three(line):
-    return '\x1b[4m' + line + '\x1b[0m'
+    return f'{_ULINE}{line}{_RESET}'
+
+## Indexed by heading level (number of leading '#')
+headings = (None, heading_one, heading_two, heading_three)
 
 def fenced_line(line, width):
     #return '\x1b[40m' + line.ljust(self.columns) + '\x1b[0m'
-    return '\x1b[48;5;239m' + line.ljust(width) + '\x1b[0m'
+    return f'{_BG_GREY}{line.ljust(width)}{_RESET}'
+
+def print_lines(lines):
+    ## One write per page instead of one print per line
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 def separation_line(title, width):
-    print('\x1b[1A\x1b[44m' + title.center(width) + '\x1b[0m')
+    print(f'{_UP}{_BG_BLUE}{title.center(width)}{_RESET}')
 
+def has_scheme(link):
+    ## Same as matching r'^[a-zA-Z]+://' but without the regex engine.
+    ## Only the start of the link is searched (schemes are short)
+    i = link.find('://', 0, 32)
+    return i > 0 and link[:i].isascii() and link[:i].isalpha()
+
+@functools.lru_cache(maxsize=2048)
 def gopher_real_link(item, parts):
-    numParts = len(parts)
-    assert numParts > 1
+    assert len(parts) > 1
     schema = 'gopher://'
-    selector = parts[1]
-    host = '' if numParts < 3 else parts[2].strip()
-    port = '' if numParts < 4 else parts[3].strip()
+    _, selector, host, port, *_ = list(parts) + ['', '']
+    host = host.strip()
+    port = port.strip()
 
     if (item == 'h') and selector.startswith('URL:'):
         selector = selector[4:].strip()
-        if re.search(r'^[a-zA-Z]+://',selector):
+        if has_scheme(selector):
             return selector  # a fully qualified URL
     if selector[0] != '/':
         return selector # A local file or directory
@@ -127,11 +147,41 @@ def gopher_real_link(item, parts):
         return schema + host + port + selector # remote file or directory
     return selector # if everything fails
 
+@functools.lru_cache(maxsize=None)
+def mime_types():
+    ## A single mime database shared by every lookup (loaded on first use)
+    import mimetypes
+    return mimetypes.MimeTypes()
+
+@functools.lru_cache(maxsize=1024)
+def guess_ext_mime(ext):
+    return mime_types().guess_type('x' + ext)[0]
+
+def guess_mime(name):
+    ## The mime type only depends on the extension (plus a possible
+    ## compression suffix such as .gz), so the lookup is cached by it
+    root, ext = os.path.splitext(name)
+    if ext.lower() in mime_types().encodings_map:
+        ext = os.path.splitext(root)[1] + ext
+    return guess_ext_mime(ext)
+
+## Gopher item of the most common extensions (anything else goes through mime)
+extItems = {
+        '.txt':  '0', '.md':  '0', '.gmi': '0', '.gemini': '0',
+        '.gif':  'g',
+        '.html': 'h', '.htm': 'h',
+        '.jpg':  'I', '.jpeg': 'I', '.png': 'I',
+        '.wav':  's', '.mp3': 's',
+        '.pdf':  '9', '.zip': '9', '.mp4': '9',
+        }
+
 def gopher_file_item(name):
-    mime = mimetypes.MimeTypes().guess_type(name)[0]
+    item = extItems.get(os.path.splitext(name)[1].lower())
+    if item:
+        return item
+    mime = guess_mime(name)
     if not mime:
-        if (name.endswith('gophermap') or name.endswith('.gmi') 
-                or name.endswith('.gemini')):
+        if name.endswith(pageFiles):
             return '0'
         else:
             return '1' # Assume directory
@@ -152,38 +202,56 @@ def gopher_file_item(name):
         item = '9' # default to Binary
     return item
 
+gopherKinds = {
+        '0': 'file', '4': 'file', '5': 'file', '6': 'file', '9': 'file',
+        'g': 'file', 'I': 'file', 'h': 'file', 's': 'file', # all kind of files
+        '1': 'dir',     # Directory
+        'i': 'txt',     # Informational message
+        '3': 'err',     # an Error
+        '+': 'svr',     # a redundant server
+        '8': 'session', # text base session (telnet, tn3270)
+        '2': 'search',  # search sessions
+        '7': 'search',
+        }
+
+@functools.lru_cache(maxsize=256)
 def link_type(item, text):
-    local = False if re.search(r'^[a-zA-Z]+://', text) else True
+    local = False if has_scheme(text) else True
     if item == '>': ## This is a gemini link, so need mime:
         item = gopher_file_item(text)
 
-    if item in ['0','4','5','6','9','g','I','h','s']:
-        return local, 'file' # all kind of files
-    elif item == '1':
-        return local, 'dir' # Directory
-    elif item == 'i':
-        return  True, 'txt' # Informational message (should not get here)
-    elif item == '3':
-        return local, 'err' # an Error
-    elif item == '+':
-        return local, 'svr' # a redundant server
-    elif item in ['8','9']:
-        return local, 'session' # text base session (telnet, tn3270)
-    elif item in ['2','7']:
-        return local, 'search' # search sessions
-    return local, 'unk'
+    kind = gopherKinds.get(item, 'unk')
+    if kind == 'txt':
+        return True, kind # Informational message (should not get here)
+    return local, kind
 
 
 class walker(cmd.Cmd):
     prompt = 'walker> '
     intro  = "Welcome to Gopher and Gemini walker\nType ? or help for list of commands."
 
+    ## Gemini files rendered as pages, by extension
+    ## (any name ending in gophermap is a gopher menu, see file_handler)
+    pageHandlers = {'.gmi':      'process_gemini_map',
+                    '.gemini':   'process_gemini_map'}
+
+    ## Files that make a directory a page, in order of preference
+    indexFiles = (('gophermap',    'process_gopher_map'),
+                  ('index.gmi',    'process_gemini_map'),
+                  ('index.gemini', 'process_gemini_map'))
+
     def __init__(self):
         cmd.Cmd.__init__(self)
-        ## Terminal size in number of columns and lines (updated often)
+        ## Terminal size in number of columns and lines (updated on SIGWINCH)
         self.lines    = 0
         self.columns  = 0
         self.minWidth = 80
+        self.update_terminal_size()
+        if hasattr(signal, 'SIGWINCH'):
+            signal.signal(signal.SIGWINCH, self.update_terminal_size)
+
+        ## Text wrappers used to render gemini pages (see text_wrappers)
+        self.wrappers = None
 
         self.paging = False # check: https://www.geeksforgeeks.org/print-colors-python-terminal/
 
@@ -200,12 +268,17 @@ class walker(cmd.Cmd):
         ## Paths can be listed by using paths (do_paths)
         ## They can be persisted in a config by using save (do_save) or read (do_read)
         self.paths  = []
+        ## paths_set is derived from paths (see paths_changed)
+        self.paths_set = set()
 
         ## Site URLs are used to process fully qualified links (by replacing them with a correct path)
         ## Site URLs can be updated by using 'add url' (do_add) or 'remove url' (do_remove)
         ## They can be listed by using urls (do_urls)
         ## They can be persisted in a config by using save (do_save) or read (do_read)
         self.site_urls = []
+        ## site_urls_set and site_urls_sorted are derived from site_urls (see site_urls_changed)
+        self.site_urls_set    = set()
+        self.site_urls_sorted = []
 
         ## Base is the path (from paths above) to the current Gopher or Gemini site being walked
         ## It can only be changed by visit (do_visit)
@@ -229,12 +302,19 @@ class walker(cmd.Cmd):
         self.stack  = []
         self.pStack = -1
 
+    def update_terminal_size(self, *args):
+        try:
+            sx = os.get_terminal_size()
+        except OSError:
+            return # Not a terminal, keep what we have
+        self.lines, self.columns  = sx.lines, sx.columns
+
     def update_stack(self, place):
         self.links = []
         if self.stack and (self.stack[self.pStack] == place):
             return
         if self.pStack != (len(self.stack) -1):
-            self.stack = self.stack[:self.pStack+1]
+            del self.stack[self.pStack+1:]
         self.stack.append(place)
         self.pStack += 1
 
@@ -265,7 +345,9 @@ class walker(cmd.Cmd):
         self.pStack = -1
 
     def remove_base(self, place):
-        return place.replace(self.base, '', 1)
+        if place.startswith(self.base):
+            return place[len(self.base):]
+        return place
 
     def new_page(self, place, title):
         separation_line(title, self.columns)
@@ -279,117 +361,111 @@ class walker(cmd.Cmd):
     ### This section do the real work of generating the output     ###
     ###        Composed of various process_* functions             ###
     ##################################################################
+    def text_wrappers(self, width):
+        ## Text, list and quote wrappers, built once and reused for every page
+        if not self.wrappers:
+            import textwrap
+            self.wrappers = (textwrap.TextWrapper(),
+                    textwrap.TextWrapper(initial_indent='*  ',
+                        subsequent_indent='   '),
+                    textwrap.TextWrapper(initial_indent=geminiFiller,
+                        subsequent_indent=geminiFiller))
+        wrapText, wrapList, wrapQuote = self.wrappers
+        wrapText.width  = width
+        wrapList.width  = width
+        wrapQuote.width = width - len(geminiFiller)
+        return self.wrappers
+
     def process_gopher_map(self, name):
         if not os.path.isfile(name):
             error('File does not exist [',name,']')
             return
         self.processing = 'gopher'
         count = 1
+        out = []
         try:
-            flSrc = open(name, 'rt')
+            with open(name, 'rt', encoding='utf-8', errors='replace') as flSrc:
+                srcLines = flSrc.read().splitlines()
             self.new_page(name, 'Gopher menu [' + 
                     self.remove_base(name) + ']')
+            fencedWidth = self.best_width()
 
-            while True:
-                line = flSrc.readline()
-                if not line:
-                    break
-                part = line.rstrip('\r\n').split('\t')
+            for line in srcLines:
+                part = line.split('\t', 4) # display, selector, host, port [, gopher+]
                 numParts = len(part)
                 item = '' if not part[0] else part[0][0]
                 if not item:
-                    print()
+                    out.append('')
                 elif (item == 'i') and (numParts > 1):
-                    print(gopherFiller + fenced_line(part[0][1:],self.best_width()))
+                    out.append(gopherFiller + fenced_line(part[0][1:],fencedWidth))
                 elif (numParts > 1) and (item in gopherItems):
                     part[0] = part[0][1:]
-                    self.links.append(item + gopher_real_link(item, part))
-                    print(gopher_link_line(count, item, part[0]))
+                    self.links.append(item + gopher_real_link(item, tuple(part)))
+                    out.append(gopher_link_line(count, item, part[0]))
                     count += 1
                 else:
-                    print(gopherFiller + part[0])
+                    out.append(gopherFiller + part[0])
+            print_lines(out)
 
         except OSError as e:
             error(e, " while processing", name)
 
-        flSrc.close()
-
     def process_gemini_map(self, name):
         if not os.path.isfile(name):
             error('File does not exist [',name,']')
             return
         self.processing = 'gemini'
         count = 1
+        out = []
         isFenced = False
         try:
-            flSrc = open(name, 'rt')
+            with open(name, 'rt', encoding='utf-8', errors='replace') as flSrc:
+                srcLines = flSrc.read().splitlines()
             self.new_page(name, 'Gemini page [' + 
                     self.remove_base(name) + ']')
             lineWidth = self.minWidth
+            fencedWidth = self.best_width()
+            wrapText, wrapList, wrapQuote = self.text_wrappers(lineWidth)
 
-            while True:
-                line = flSrc.readline()
-                if not line:
-                    break
-                line = line.rstrip('\r\n')
-                
+            for line in srcLines:
                 ## From: https://gemini.circumlunar.space/docs/specification.html
                 ## Note that I relaxed the start of the line to allow spaces 
                 ##      (as it is not clear in the spec)
-                if re.search(r"^\s*```",line): # Section 5.4.3 Preformatting toggle lines
+                stripped = line.lstrip('\t ')
+                c0, c1 = stripped[:1], stripped[1:2]
+                if c0 == '`' and stripped.startswith('```'): # Section 5.4.3 Preformatting toggle lines
                     isFenced = not isFenced
-                    continue
-                if isFenced:                   # Section 5.4.4 Preformated text lines
-                    print(geminiFiller + fenced_line(line,self.best_width()))
-                    continue
-                if not line.strip('\t '):
-                    print()
-                if re.search(r'^\s*=>',line):  # Section 5.4.2 Link lines
-                    line  = line.strip()[2:].strip()
-                    parts = re.split(r'\s+',line, 1)
+                elif isFenced:                   # Section 5.4.4 Preformated text lines
+                    out.append(geminiFiller + fenced_line(line,fencedWidth))
+                elif not c0:
+                    out.append('')
+                elif c0 == '=' and c1 == '>':    # Section 5.4.2 Link lines
+                    line  = stripped[2:].strip()
+                    parts = line.split(None, 1) or ['']
                     label = parts[0] if len(parts) == 1 else parts[1]
                     self.links.append('>' + parts[0].strip())
-                    print(gemini_link_line(count, label))
+                    out.append(gemini_link_line(count, label))
                     count += 1
-                    continue
-                if re.search(r'^\s*#+',line):  # Section 5.5.1 Heading lines
-                    line  = line.strip('\t ')
-                    if line.startswith('###'):
-                        line  = line[3:].strip('\t ')
-                        print(geminiFiller + heading_three(line))
-                    elif line.startswith('##'):
-                        line  = line[2:].strip('\t ')
-                        print(geminiFiller + heading_two(line))
-                    else:
-                        line  = line[1:].strip('\t ')
-                        print(geminiFiller + heading_one(line))
-                    continue
-                if re.search(r'^\s*\* ',line): # Section 5.5.2 Unordered list items
-                    lines = textwrap.wrap(line.strip('\t ')[2:],
-                            initial_indent='*  ', subsequent_indent='   ',
-                            width = lineWidth)
-                    for l in lines:
-                        print(geminiFiller + l)
-                    continue
-                if re.search(r'^\s*>',line):   # Section 5.5.3 Quote lines
-                    lines = textwrap.wrap(line.strip('\t ')[1:],
-                            initial_indent=geminiFiller, 
-                            subsequent_indent=geminiFiller, 
-                            width = lineWidth - len(geminiFiller))
-                    for l in lines:
-                        print(geminiFiller + l)
-                    continue
-                                               # Section 5.4.1 Text lines
-                lines = textwrap.wrap(line, width = lineWidth)
-                for l in lines:
-                    print(geminiFiller + l)
+                elif c0 == '#':                  # Section 5.5.1 Heading lines
+                    level = 1 if c1 != '#' else (3 if stripped[2:3] == '#' else 2)
+                    out.append(geminiFiller + 
+                            headings[level](stripped[level:].strip('\t ')))
+                elif c0 == '*' and c1 == ' ':    # Section 5.5.2 Unordered list items
+                    lines = wrapList.wrap(stripped[2:])
+                    out.extend(geminiFiller + l for l in lines)
+                elif c0 == '>':                  # Section 5.5.3 Quote lines
+                    lines = wrapQuote.wrap(stripped[1:])
+                    out.extend(geminiFiller + l for l in lines)
+                else:                            # Section 5.4.1 Text lines
+                    lines = wrapText.wrap(line)
+                    out.extend(geminiFiller + l for l in lines)
+            print_lines(out)
 
         except OSError as e:
             error(e, " while processing", name)
 
-        flSrc.close()
-
     def process_external_app(self, name):
+        import subprocess
         try:
             self.new_page(name, 'Invoke app [' + 
                     self.remove_base(name) + ']') 
@@ -400,52 +476,74 @@ class walker(cmd.Cmd):
 
     def process_text_file(self, name):
         try:
-            flSrc = open(name, 'rt')
+            with open(name, 'rb') as flSrc:
+                data = flSrc.read()
             self.new_page(name, 'Text file [' + 
                     self.remove_base(name) + ']')
 
-            while True:
-                line = flSrc.readline()
-                if not line:
-                    break
-                print(line)
+            if data and not data.endswith(b'\n'):
+                data += b'\n'
+            ## The file goes to the terminal as is (no decoding)
+            sys.stdout.flush()
+            if self.paging and self.lines > 2:
+                self.page_bytes(data)
+            else:
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
 
         except OSError as e:
             error(e, " while processing", name)
 
-        flSrc.close()
+    def page_bytes(self, data):
+        ## Output one screen at a time (see 'set paging')
+        lines = data.splitlines(keepends=True)
+        step = self.lines - 2
+        for i in range(0, len(lines), step):
+            sys.stdout.buffer.write(b''.join(lines[i:i+step]))
+            sys.stdout.buffer.flush()
+            if i + step >= len(lines):
+                break
+            try:
+                if input('-- More -- (q to stop) ').strip().lower() == 'q':
+                    break
+            except EOFError:
+                break
 
     def process_gopher_dir(self, name):
         self.processing = 'gopher'
         count = 1
         try:
-            files = os.listdir(name)
+            with os.scandir(name) as it:
+                entries = sorted(it, key=lambda e: e.name)
             self.new_page(name, 'Gopher directory [' + 
                     self.remove_base(name) + ']')
 
-            print('\nContent:\n')
-            for filename in files:
-                path = os.path.join(name,filename)
-                item = '1' if os.path.isdir(path) else gopher_file_item(filename)
+            out = ['', 'Content:', '']
+            for entry in entries:
+                item = '1' if entry.is_dir() else gopher_file_item(entry.name)
                 # Path must be relative to base
-                self.links.append(item + (path.replace(self.base, '', 1)))
-                print(gopher_link_line(count, item, filename))
+                self.links.append(item + self.remove_base(entry.path))
+                out.append(gopher_link_line(count, item, entry.name))
                 count += 1
-            print()
+            out.append('')
+            print_lines(out)
 
         except OSError as e:
             error(e, " while processing", name)
 
     def process_url(self, url):
+        import webbrowser
         self.new_page(url, 'URL [' + url + ']')
         webbrowser.open(url)
 
     def print_list(self, lst, padding=' ', marker=0):
         count = 1
+        out = []
         for l in lst:
-            print('{}{:2d} {} \x1b[38;5;119m{}\x1b[0m'.format(padding, 
-                count, '  ' if marker != count else '=>', l))
+            mark = '  ' if marker != count else '=>'
+            out.append(f'{padding}{count:2d} {mark} {_GREEN}{l}{_RESET}')
             count += 1
+        print_lines(out)
 
     ##################################################################
     ###                    Navigation section                      ###
@@ -457,7 +555,7 @@ class walker(cmd.Cmd):
         if not os.path.isfile(name):
             error('Must be a valid file [',name,']')
             return
-        mime = mimetypes.MimeTypes().guess_type(name)[0]
+        mime = guess_mime(name)
         if not mime:
             error('Unknown file type [',name,']')
             return
@@ -467,16 +565,25 @@ class walker(cmd.Cmd):
         else:
             self.process_external_app(name)
 
+    def paths_changed(self):
+        self.paths_set = set(self.paths)
+
+    def site_urls_changed(self):
+        self.site_urls_set    = set(self.site_urls)
+        ## Longest first, so the most specific site URL is tried first
+        self.site_urls_sorted = sorted(self.site_urls, key=len, reverse=True)
+
     def rebase_link(self, link):
-        for url in self.site_urls:
+        for url in self.site_urls_sorted:
             if link.startswith(url):
                 ## First try our current base
-                new = link.replace(url,self.base,1)
+                rest = link[len(url):]
+                new = self.base + rest
                 if os.path.exists(new):
                     return new
                 ## Now try other paths
                 for p in self.paths:
-                    new = link.replace(url,p,1)
+                    new = p + rest
                     if os.path.exists(new):
                         self.base = p
                         self.clear_stack()
@@ -494,6 +601,13 @@ class walker(cmd.Cmd):
         else:
             return os.path.dirname(stk)
 
+    def file_handler(self, name):
+        ## Pages are rendered here, any other file goes to visit_file
+        if name.endswith('gophermap'):
+            return self.process_gopher_map
+        process = self.pageHandlers.get(os.path.splitext(name)[1])
+        return getattr(self, process) if process else self.visit_file
+
     def visit_link(self, id):
         try:
             link = self.links[id]
@@ -511,12 +625,7 @@ class walker(cmd.Cmd):
             if local and (kind == 'dir'):
                 self.visit(localLink)
             elif local and (kind == 'file'):
-                if rest.endswith('gophermap'):
-                    self.process_gopher_map(localLink)
-                elif rest.endswith('.gmi') or rest.endswith('.gemini'):
-                    self.process_gemini_map(localLink)
-                else:
-                    self.visit_file(localLink)
+                self.file_handler(rest)(localLink)
             elif not local:
                 self.process_url(rest)
             else:
@@ -526,38 +635,28 @@ class walker(cmd.Cmd):
             print('Invalid link id')
 
     def visit_stack(self, place):
-        if re.search(r'^[a-zA-Z]+://',place):
+        if has_scheme(place):
             self.process_url(place)
         elif os.path.isdir(place):
             self.visit(place)
         elif os.path.isfile(place):
-            if place.endswith('.gmi') or place.endswith('.gemini'):
-                self.process_gemini_map(place)
-            elif place.endswith('gophermap'):
-                self.process_gopher_map(place)
-            else:
-                self.visit_file(place)
+            self.file_handler(place)(place)
         else:
             error("Unknown place [",place,"]")
 
     def visit(self, place):
         '''Place must be a fully qualified directory path'''
 
-        if not os.path.isdir(place):
+        try:
+            with os.scandir(place) as it:
+                names = {e.name for e in it if e.is_file()}
+        except OSError:
             error('Place must be a valid directory [',place,']')
             return
-        name = place.rstrip(os.sep) + os.sep + 'gophermap'
-        if os.path.isfile(name):
-            self.process_gopher_map(name)
-            return
-        name = place.rstrip(os.sep) + os.sep + 'index.gmi'
-        if os.path.isfile(name):
-            self.process_gemini_map(name)
-            return
-        name = place.rstrip(os.sep) + os.sep + 'index.gemini'
-        if os.path.isfile(name):
-            self.process_gemini_map(name)
-            return
+        for index, process in self.indexFiles:
+            if index in names:
+                getattr(self, process)(place.rstrip(os.sep) + os.sep + index)
+                return
         if self.processing and (self.processing == 'gopher'):
             self.process_gopher_dir(place)
         elif self.processing and (self.processing == 'gemini'):
@@ -571,9 +670,8 @@ class walker(cmd.Cmd):
     ###  This section deals with the cmd.Cmd stuff (do_*, etc.)   ###
     #################################################################
     def precmd(self, line):
-        sx = os.get_terminal_size()
-        # set the terminal configuration:
-        self.lines, self.columns  = sx.lines, sx.columns
+        if not hasattr(signal, 'SIGWINCH'):
+            self.update_terminal_size()
         self.last_cmd = self.lastcmd
         if self.columns < self.minWidth:
             warn("Terminal too narrow at ",self.columns," (min ",self.minWidth,")\n")
@@ -585,9 +683,13 @@ class walker(cmd.Cmd):
     def do_shell(self, line):
         '''Run a shell command (shortcut: '!')'''
         print("line:",line)
-        out = os.popen(line).read()
-        print(out)
-        self.last_output = out
+        import subprocess
+        proc = subprocess.run(line, shell=True, stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(proc.stdout)
+        sys.stdout.buffer.flush()
+        self.last_output = proc.stdout
 
     def help_exit(self):
         print("Exit execution (shortcuts: 'q', 'e' and '<Ctrl>-D')")
@@ -600,11 +702,13 @@ class walker(cmd.Cmd):
         separation_line('List of raw links in [' + 
                 self.remove_base(self.current_stack()) + ']', self.columns)
         count = 1
+        out = []
         for link in self.links:
             item = link[0]
-            rest = link[1:] if not link[1:].startswith('URL:') else link[5:]
-            print(gopher_link_line(count, item, rest))
+            rest = link[5:] if link.startswith('URL:', 1) else link[1:]
+            out.append(gopher_link_line(count, item, rest))
             count += 1
+        print_lines(out)
 
     def do_visit(self, line):
         '''Visit a path to a Gopher hole or Gemini capsule (shortcut 'v')\nv[isit] [<path-number>|<path>]'''
@@ -619,7 +723,7 @@ class walker(cmd.Cmd):
                 else:
                     error("invalid path index")
             else:
-                if not (path in self.paths):
+                if not (path in self.paths_set):
                     self.base = path.rstrip(os.sep)
             self.visit(self.base)
         else:
@@ -655,19 +759,23 @@ class walker(cmd.Cmd):
         '''Save configuration to <file> (shortcut 's')\ns[ave] [<file>] (default to config.json)'''
         name = line.strip("'\"\t ")
         name = name if name else 'config.json'
+        import json
         config = { 'paths' : self.paths, 'site_urls' : self.site_urls }
         with open(name, 'w') as fl:
             json.dump(config, fl)
         print("saved to",name)
 
     def do_read(self, line):
-        '''Read configuration from <file> (shortcut 'r')\nre[ad] [<file>] (default to config.json)'''
+        '''Read configuration from <file> (shortcut 'r')\nr[ead] [<file>] (default to config.json)'''
         name = line.strip("'\"\t ")
         name = name if name else 'config.json'
+        import json
         with open(name, 'r') as fl:
             config = json.load(fl)
         self.paths     = list(filter(None, config['paths']))
         self.site_urls = list(filter(None, config['site_urls']))
+        self.paths_changed()
+        self.site_urls_changed()
         print("read from",name)
 
     ### This section deal with list of paths commands ###
@@ -681,19 +789,23 @@ class walker(cmd.Cmd):
         if what[0].strip().lower() in ['p', 'path']:
             path = what[1].strip("'\"\t ")
             if path:
-                if not (path in self.paths):
-                    self.paths.append(path.rstrip(os.sep))
+                path = path.rstrip(os.sep)
+                if not (path in self.paths_set):
+                    self.paths.append(path)
+                    self.paths_changed()
         elif what[0].strip().lower() in ['u', 'url']:
             url = what[1].strip()
             if url:
-                if not (url in self.site_urls):
-                    self.site_urls.append(url.rstrip(os.sep))
+                url = url.rstrip(os.sep)
+                if not (url in self.site_urls_set):
+                    self.site_urls.append(url)
+                    self.site_urls_changed()
         else:
             error("Invalid type 'a[dd] [p[ath] <path> | u[rl] <url>]'") 
             return
 
     def do_remove(self, line):
-        '''Remove a <path> from paths (shortcut 're')\nr[emove] [p[ath] <number>|<path>] [u[rl] <number>|<url>]'''
+        '''Remove a <path> from paths (shortcut 're')\nre[move] [p[ath] <number>|<path>] [u[rl] <number>|<url>]'''
         what = line.strip().split(' ',1)
         if len(what) != 2:
             error("Missing component should be 're[move] [p[ath] <number>|<path>] [u[rl] <number>|<url>]'") 
@@ -705,11 +817,13 @@ class walker(cmd.Cmd):
                 if path.isdigit():
                     if int(path) < len(self.paths):
                         del self.paths[int(path)]
+                        self.paths_changed()
                     else:
                         error("invalid index")
                 else:
-                    if path in self.paths:
+                    if path in self.paths_set:
                         self.paths.remove(path)
+                        self.paths_changed()
                     else:
                         error("path not in list")
         elif what[0].strip().lower() in ['u', 'url']:
@@ -718,11 +832,13 @@ class walker(cmd.Cmd):
                 if url.isdigit():
                     if int(url) < len(self.site_urls):
                         del self.site_urls[int(url)]
+                        self.site_urls_changed()
                     else:
                         error("invalid index")
                 else:
-                    if url in self.site_urls:
+                    if url in self.site_urls_set:
                         self.site_urls.remove(url)
+                        self.site_urls_changed()
                     else:
                         error("url not in list")
         else:
@@ -754,8 +870,8 @@ class walker(cmd.Cmd):
                 "\n    Columns:   ",self.columns,
                 "\n    min width: ",self.minWidth,
                 "\nProcessing:",self.processing,
-                "\nBase: \x1b[38;5;119m ",self.base,
-                "\x1b[0m\nPaths:", sep='')
+                "\nBase: ",_GREEN," ",self.base,
+                _RESET,"\nPaths:", sep='')
         self.print_list(self.paths,'    ')
         print("\nSite URLs:")
         self.print_list(self.site_urls,'    ')
@@ -765,31 +881,29 @@ class walker(cmd.Cmd):
         self.print_list(self.stack,'    ',self.pStack+1)
 
 
+    ## Shortcuts handled by default (as documented in each do_* docstring)
+    shortcuts = {
+            'q':  'do_exit',
+            'e':  'do_exit',
+            'p':  'do_paths',
+            'l':  'do_links',
+            'a':  'do_add',
+            're': 'do_remove',
+            'r':  'do_read',
+            's':  'do_save',
+            'b':  'do_back',
+            'f':  'do_forward',
+            'v':  'do_visit',
+            }
+
     def default(self, line):
         ln = line.split(' ',1)
         line = '' if len(ln) <= 1 else ln[1]
         CMD = ln[0].strip()
-        if CMD in ['q','e']:
-            return self.do_exit(line)
-        elif CMD == 'p':
-            return self.do_paths(line)
-        elif CMD == 'l':
-            return self.do_links(line)
-        elif CMD == 'a':
-            return self.do_add(line)
-        elif CMD == 'r':
-            return self.do_remove(line)
-        elif CMD == 're':
-            return self.do_read(line)
-        elif CMD == 's':
-            return self.do_save(line)
-        elif CMD == 'b':
-            return self.do_back(line)
-        elif CMD == 'f':
-            return self.do_forward(line)
-        elif CMD == 'v':
-            return self.do_visit(line)
-        elif CMD.isdigit():
+        handler = self.shortcuts.get(CMD)
+        if handler:
+            return getattr(self, handler)(line)
+        if CMD.isdigit():
             if (self.last_cmd in ['p', 'paths'] 
                     and (0 < int(CMD) <= len(self.paths))):
                 return self.do_visit(CMD)
@@ -806,172 +920,268 @@ class walker(cmd.Cmd):
     help_quit = help_exit
 
 
-def offline_walk(w):
-
+def iter_files(root):
+    # Yields the path of every file under root (like os.walk, symlinked
+    # directories are not followed). The DirEntry already knows its type,
+    # so there is no extra stat per entry
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_files(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+    except OSError:
+        return # Unreadable or not a directory (same as os.walk)
+
+
+## Site entry points (relative to the site directory)
+_GOPHERMAP = os.sep + "gophermap"
+_INDEXGMI  = os.sep + "index.gmi"
+
+## Lookup table (by first byte of the line) of the gopher items
+## of the links followed when walking a hole offline
+linkItems = bytes(1 if c in b'01456g9Ihs' else 0 for c in range(256))
+
+def gopher_hole(path): # input path is a file name
+    # path is a fully qualified file name
+    # returns the set of files visited, the set of external links found
+    # and the messages to print for the site (workers must not print)
+    files = set()
+    log   = []
+    seen  = set() ## targets already visited
+    missing  = set() ## targets found not present
+    reported = set() ## (local, name) references already reported as broken
     eLink = set()
 
-    def gopher_hole(path): # input path is a file name
-        # path is a fully qualified file name
-        files = set()
-
-        def extract_links(item,base,local, name): 
-            # item is the gopher line item (first charcter of the line)
-            # base is site base (directory of initial index.gmi)
-            # local is the local directory 
-            # name is the file name to extract links from
-            links = set()
-            listFiles = []
-            nonlocal files
-            nonlocal eLink
-            # We set the fileName to open depending of the original name that is 
-            # indicated by the first char of the name
-            # a '/' indicates relatibe to the base, otherwise relative to the file was being analyzed
-            fileName = base + name if name and name[0] == os.sep else local + os.sep + name
-            if os.path.isdir(fileName):
-                if fileName[-1] == os.sep:
-                    name = fileName + "gophermap"
-                else:
-                    name = fileName + os.sep + "gophermap"
-                if os.path.isfile(name):
-                    fileName = name
-            vbprint("Extracting:[",fileName,"[",base,"]",local,"[",name,"]",sep='')
-            if not os.path.isfile(fileName) and not os.path.isdir(fileName):
-                print("ERROR: path not present [",fileName,"]\nALL:",item,"[",base,"]",local,"[",name,"]",sep='')
-                return
-            if os.path.isdir(fileName):
-                # Note that in gopher a directory without a gophermap mean that all files should be listed in the client
-                listFiles = os.listdir(fileName) 
-            if fileName in files:
-                return
-            if listFiles:
-                files.update(listFiles)
+    assert os.path.basename(path) == "gophermap", path
+    base = os.path.dirname(path)
+    log.append("Gopher hole: " + path)
+    # Work list of links to extract links from, as (item, local, name) where
+    # item is the gopher line item (first charcter of the line)
+    # local is the local directory 
+    # name is the file name to extract links from
+    # (base is site base, the directory of the initial gophermap)
+    work = collections.deque([('1', base, _GOPHERMAP)])
+    while work:
+        item, local, name = work.popleft()
+        links = set()
+        # We set the fileName to open depending of the original name that is 
+        # indicated by the first char of the name
+        # a '/' indicates relatibe to the base, otherwise relative to the file was being analyzed
+        fileName = base + name if name and name[0] == os.sep else local + os.sep + name
+        fileName = os.path.normpath(fileName)
+        if fileName in seen:
+            continue
+        # A missing target is looked up once, but every reference to it is reported
+        if fileName not in missing:
+            # One stat tells us whether it exists and whether it is a directory
+            try:
+                mode = os.stat(fileName).st_mode
+            except OSError:
+                mode = 0
+            if stat.S_ISDIR(mode) or stat.S_ISREG(mode):
+                seen.add(fileName)
             else:
-                files.add(fileName)
-            if not fileName.endswith("gophermap"):
-                return
-            vbprint("Processing:",fileName)
-            with open(fileName,'r') as hole:
-                for line in hole:
-                    line = line.rstrip(' \r\n')
-                    if not line:
-                        continue
-                    item = line[0]
-                    if not item in ['0','1','4','5','6','9','g','I','h','s']:
-                        continue
-                    linePart = line.split('\t')
-                    if len(linePart) == 1: # Gopher lines without tabs are just text
-                        continue
-                    if len(linePart) < 2:
-                        print("ERROR invalid link: [",line,"]",sep='')
-                        continue
-                    url = linePart[1]
-                    if len(url) > 0:
-                        links.add(item + url)
-
-            new_local = os.path.dirname(fileName)
-            for l in links:
-                if re.match(r'^hURL:',l):
-                    eLink.add(l)
+                missing.add(fileName)
+        if fileName in missing:
+            if verbose:
+                log.append(f"Extracting:[{fileName}[{base}]{local}[{name}]")
+            if (local, name) not in reported:
+                reported.add((local, name))
+                log.append(f"ERROR: path not present [{fileName}]\nALL:{item}[{base}]{local}[{name}]")
+            continue
+        isDir = stat.S_ISDIR(mode)
+        if isDir:
+            name = fileName + _GOPHERMAP
+            if os.path.isfile(name):
+                fileName = name
+                isDir = False
+        if verbose:
+            log.append(f"Extracting:[{fileName}[{base}]{local}[{name}]")
+        if isDir:
+            # Note that in gopher a directory without a gophermap mean that all files should be listed in the client
+            with os.scandir(fileName) as it:
+                files.update(e.path for e in it if e.is_file())
+            continue
+        if fileName in files:
+            continue
+        files.add(fileName)
+        if not fileName.endswith("gophermap"):
+            continue
+        if verbose:
+            log.append("Processing: " + fileName)
+        with open(fileName,'rb',buffering=65536) as hole:
+            for line in hole:
+                line = line.rstrip(b' \r\n')
+                if not line or not linkItems[line[0]]:
+                    continue
+                tab = line.find(b'\t')
+                if tab < 0: # Gopher lines without tabs are just text
+                    continue
+                end = line.find(b'\t', tab + 1)
+                url = line[tab + 1:] if end < 0 else line[tab + 1:end]
+                if not url:
+                    continue
+                link = chr(line[0]) + url.decode('utf-8', 'replace')
+                if link.startswith('hURL:'):
+                    eLink.add(link) # External links are not followed
                 else:
-                    extract_links(l[0],base, new_local, l[1:])
-            return
+                    links.add(link)
+
+        new_local = os.path.dirname(fileName)
+        work.extend((l[0], new_local, l[1:]) for l in links)
+    return files, eLink, log
+
+def gemini_capsule(path): 
+    # path is a fully qualified file name
+    # returns the set of files visited, the set of external links found
+    # and the messages to print for the site (workers must not print)
+    files = set()
+    log   = []
+    seen  = set() ## targets already visited
+    reported = set() ## (local, name) references already reported as broken
+    eLink = set()
+    dirFiles = {} ## directory -> names of the regular files in it
+
+    def is_file(fileName):
+        ## One scandir per directory answers every link into it
+        folder, name = os.path.split(fileName)
+        if folder not in dirFiles:
+            try:
+                with os.scandir(folder or os.curdir) as it:
+                    dirFiles[folder] = {e.name for e in it if e.is_file()}
+            except OSError:
+                dirFiles[folder] = set()
+        return name in dirFiles[folder]
+
+    assert os.path.basename(path) == "index.gmi", path
+    base = os.path.dirname(path)
+    log.append(f"Gemini capsule: [{path}] in {base}")
+    # Work list of links to extract links from, as (local, name) where
+    # local is the local directory 
+    # name is the file name to extract links from
+    # (base is site base, the directory of the initial index.gmi)
+    work = collections.deque([(base, _INDEXGMI)])
+    while work:
+        local, name = work.popleft()
+        links = set()
+        # We set the fileName to open depending of the original name that is 
+        # indicated by the first char of the name
+        # a '/' indicates relatibe to the base, otherwise relative to the file was being analyzed
+        fileName = base + name if name and name[0] == os.sep else local + os.sep + name
+        fileName = os.path.normpath(fileName)
+        if fileName in seen:
+            continue
+        if verbose:
+            log.append(f"Extracting:[{fileName}[{base}]{local}[{name}]")
+        # Missing files are looked up once (see is_file), but every reference to them is reported
+        if not is_file(fileName):
+            if (local, name) not in reported:
+                reported.add((local, name))
+                log.append(f"ERROR: File not present [{fileName}]\nALL:[{base}]{local}[{name}]")
+            continue
+        seen.add(fileName)
+        files.add(fileName)
+        if not fileName.endswith(".gmi"):
+            continue
+        if verbose:
+            log.append("Processing: " + fileName)
+        with open(fileName,'r',encoding='utf-8',errors='replace',
+                buffering=65536) as capsule:
+            for line in capsule:
+                if not line.startswith("=>"):
+                    continue
+                parts = line[2:].split(None, 1) # url [label]
+                if not parts:
+                    continue
+                if _RE_EXTERNAL.match(parts[0]):
+                    eLink.add(parts[0]) # External links are not followed
+                else:
+                    links.add(parts[0])
 
+        new_local = os.path.dirname(fileName)
+        work.extend((new_local, l) for l in links)
+    return files, eLink, log
 
-        base = path[:-1*len(os.sep + "gophermap")]
-        print("Gopher hole:",path)
-        extract_links('1',base, base, os.sep + "gophermap")
-        return files
-
-    def gemini_capsule(path): 
-        # path is a fully qualified file name
-        files = set()
-        eLink = set()
-
-        def extract_links(base,local, name): 
-            # base is site base (directory of initial index.gmi)
-            # local is the local directory 
-            # name is the file name to extract links from
-            links = set()
-            nonlocal files
-            nonlocal eLink
-            # We set the fileName to open depending of the original name that is 
-            # indicated by the first char of the name
-            # a '/' indicates relatibe to the base, otherwise relative to the file was being analyzed
-            fileName = base + name if name and name[0] == os.sep else local + os.sep + name
-            vbprint("Extracting:[",fileName,"[",base,"]",local,"[",name,"]",sep='')
-            if not os.path.isfile(fileName):
-                print("ERROR: File not present [",fileName,"]\nALL:[",base,"]",local,"[",name,"]",sep='')
-                return 
-            if fileName in files:
-                return
-            files.add(fileName)
-            if not fileName.endswith(".gmi"):
-                return
-            vbprint("Processing:",fileName)
-            with open(fileName,'r') as capsule:
-                for line in capsule:
-                    if not line.startswith("=>"):
-                        continue
-                    url = re.split(r'[ \t]+',line[2:].lstrip(" \t"))[0]
-                    if len(url) > 0:
-                        links.add(url)
-
-            new_local = os.path.dirname(fileName)
-            for l in links:
-                if re.match(r'^[a-z]*:',l):
-                    eLink.add(l)
-                else:
-                    extract_links(base, new_local, l)
-            return 
+def init_worker(isVerbose):
+    # Workers may not inherit module globals (spawn start method)
+    global verbose
+    verbose = isVerbose
 
-        base = path[:-1*len(os.sep + "index.gmi")]
-        print("Gemini capsule: [",path,"] in ",base,sep='')
-        extract_links(base, base, os.sep + "index.gmi")
-        return files
+def walk_site(kind, path):
+    return gopher_hole(path) if kind == 'gopher' else gemini_capsule(path)
 
+def scan_files(path):
+    return list(iter_files(path))
+
+
+def offline_walk(w):
+
+    eLink = set()
     visited_files = set()
     visited_sites = set()
+    # Each site is walked independently, so collect them first and walk
+    # them in parallel (one process per site)
+    jobs = []
+    headers = [] # Per path, its header lines and its job (None if invalid)
     for path in w.paths:
-        print("\nProcessing:",path)
+        lines = ["\nProcessing: " + path]
+        job = len(jobs)
         if os.path.isdir(path):
-            if os.path.isfile(path + os.sep + "gophermap"):
-                visited_files |= gopher_hole(path + os.sep + "gophermap")
+            if os.path.isfile(path + _GOPHERMAP):
+                jobs.append(('gopher', path + _GOPHERMAP))
                 visited_sites.add(path)
-            elif os.path.isfile(path + os.sep + "index.gmi"):
-                visited_files |= gemini_capsule(path + os.sep + "index.gmi")
+            elif os.path.isfile(path + _INDEXGMI):
+                jobs.append(('gemini', path + _INDEXGMI))
                 visited_sites.add(path)
             else:
-                print("Invalid path:",path,"[Missing either gophermap or index.gmi]")
-        elif os.path.isfile(path) and path.endswith("gophermap"):
-            visited_files |= gopher_hole(path)
-            visited_sites.add(path[:-1*len(os.sep + "gophermap")])
-        elif os.path.isfile(path) and path.endswith("index.gmi"):
-            visited_files |= gemini_capsule(path)
-            visited_sites.add(path[:-1*len(os.sep + "index.gmi")])
+                lines.append("Invalid path: " + path + " [Missing either gophermap or index.gmi]")
+        elif os.path.basename(path) == "gophermap" and os.path.isfile(path):
+            jobs.append(('gopher', path))
+            visited_sites.add(os.path.dirname(path))
+        elif os.path.basename(path) == "index.gmi" and os.path.isfile(path):
+            jobs.append(('gemini', path))
+            visited_sites.add(os.path.dirname(path))
         else:
-            print("Invalid path:",path,"[Not a directory, a gophermap, or a index.gmi]")
-
-    # This is what we have collected
+            lines.append("Invalid path: " + path + " [Not a directory, a gophermap, or a index.gmi]")
+        headers.append((lines, job if job < len(jobs) else None))
+
+    if len(jobs) > 1:
+        import multiprocessing
+        sys.stdout.flush() # Otherwise forked workers repeat our pending output
+        with multiprocessing.Pool(min(len(jobs), os.cpu_count() or 4),
+                init_worker, (verbose,)) as pool:
+            results = pool.starmap(walk_site, jobs)
+    else:
+        results = [walk_site(kind, path) for kind, path in jobs]
+    # The workers only return their messages, print them under each site
+    for lines, job in headers:
+        print_lines(lines if job is None else lines + results[job][2])
+    # Listing the trees is I/O bound, threads are enough (and started
+    # only after the pool, so no process is forked with threads running)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(min(32, (os.cpu_count() or 4) * 4)) as ex:
+        siteFiles = list(ex.map(scan_files, w.paths))
+    for files, links, _ in results:
+        visited_files.update(files)
+        eLink.update(links)
+
+    # This is what we have collected (one write per section)
     print("Visited sites:")
-    for s in visited_sites:
-        print("Site:",s)
+    print_lines(["Site: " + s for s in visited_sites])
     print("Ignored exteral links:")
-    for e in eLink:
-        print("External Link:",e)
+    print_lines(["External Link: " + e for e in eLink])
     print("Visited files:")
-    for f in visited_files:
-        print("File:",f)
+    print_lines(["File: " + f for f in visited_files])
 
     # Now we need to files that were not linked (meaning not in the visited_file set)
     # For that we need to navigate the whole directory structure provided as the input
     print("Orphan files:")
-    for path in w.paths:
-        for root, dirs, files in os.walk(path):
-            for name in files:
-                #print(os.path.join(root,name)," [",root,"]",name,sep='')
-                fullName = os.path.join(root,name)
-                if not fullName in visited_files:
-                    print("Orphan:",fullName)
+    discovered = set()
+    for files in siteFiles:
+        discovered.update(os.path.normpath(f) for f in files)
+    print_lines(["Orphan: " + f for f in sorted(discovered - visited_files)])
 
 
 def arguments() :
@@ -1020,6 +1230,7 @@ if __name__ == "__main__":
              error("Invalid site-url argument (must start with either gopher:// or gemini://)")
              arguments()
          walk.site_urls.append(arSiteUrl)
+         walk.site_urls_changed()
       elif opt in ("-c", "--config"):
          walk.do_read(arg)
       elif opt in ("-w", "--width"):
@@ -1031,6 +1242,7 @@ if __name__ == "__main__":
    if args:
        for arg in args:
            walk.paths.append(arg.rstrip(os.sep))
+       walk.paths_changed()
 
    if mode == "online":
        walk.cmdloop()